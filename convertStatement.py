@@ -1,65 +1,163 @@
 #!/usr/bin/env python3
 import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import pdfplumber
+from pdfminer.pdfpage import PDFPage
 import re
 import csv
 
-def extract_transactions(pdf_path, output_csv):
-    date_re = re.compile(r'^\d{2}/\d{2}/\d{2}')
-    amt_re  = re.compile(r'\$?([\d,]+\.\d{2})$')
+# A transaction is a date-started line plus any following lines up to the
+# next date, a blank line or a lone "t"; group 2 holds those continuations.
+# Lines arrive unstripped, so surrounding whitespace ([^\S\n]) is allowed
+# and only the captured text gets stripped.
+_TX_RE = re.compile(
+    r'^[^\S\n]*(\d{2}/\d{2}/\d{2}[^\n]*)'
+    r'((?:\n(?![^\S\n]*(?:\d{2}/\d{2}/\d{2}|[tT]?[^\S\n]*$))[^\n]*)*)',
+    re.MULTILINE
+)
+_AMT_RE = re.compile(r'\$?([\d,]+\.\d{2})$')
 
-    # 1) Read every line from every page
-    lines = []
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "wf-bilt"
+)
+# Bump whenever read_lines() output changes so stale entries are ignored.
+CACHE_VERSION = 1
+
+def _page_text(page):
+    text = page.extract_text() or ""
+    # drop the page's cached layout objects so memory stays flat per page
+    page.close()
+    return text
+
+def _extract_page_range(pdf_path, start, stop):
+    # Each worker opens its own handle once for its run of pages;
+    # pdfplumber objects don't pickle. pages= is 1-based and keeps
+    # pdfplumber from building a Page for the rest of the document.
+    pages = list(range(start + 1, stop + 1))
+    with pdfplumber.open(pdf_path, pages=pages) as pdf:
+        return [_page_text(page) for page in pdf.pages]
+
+def _page_count(pdf):
+    # walk the pages the way pdfplumber does (page tree, with pdfminer's
+    # fallback scan), but without building a Page for each one
+    return sum(1 for _ in PDFPage.create_pages(pdf.doc))
+
+def read_lines(pdf_path, executor=None):
+    # pdfplumber keeps each description on the same line as its amount;
+    # pypdfium2's get_text_range() emits text in content-stream order and
+    # splits the two apart, so it can't feed the line parser below.
+    # If no executor is passed in, a pool is started just for this PDF.
     with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            text = page.extract_text() or ""
-            for L in text.splitlines():
-                lines.append(L.strip())
-
-    # 2) Walk through lines, picking out date-started blocks
-    transactions = []
-    i = 0
-    while i < len(lines):
-        L = lines[i]
-        if date_re.match(L):
-            # parse date + amount on this line
-            date = L[:8]
-            # try to pull amount at end
-            m_amt = amt_re.search(L)
-            if m_amt:
-                amount = m_amt.group(1)
-                # description is everything between date and amount
-                desc = L[9: m_amt.start()].strip()
-            else:
-                amount = ""
-                desc = L[9:].strip()
-
-            # 3) append any following lines until next date or blank or lone "t"
-            j = i + 1
-            while j < len(lines):
-                nxt = lines[j]
-                if date_re.match(nxt) or nxt == "" or nxt.lower() == "t":
-                    break
-                desc += " " + nxt
-                j += 1
-
-            transactions.append({
-                "date": date,
-                "description": desc,
-                "amount": amount
-            })
-            i = j
+        n = _page_count(pdf)
+        workers = min(os.cpu_count() or 1, n)
+        if workers <= 1:
+            texts = [_page_text(page) for page in pdf.pages]
+    if workers > 1:
+        # pages are independent, so give each worker a contiguous range;
+        # map() keeps the ranges in page order
+        bounds = [n * k // workers for k in range(workers + 1)]
+        args = ([pdf_path] * workers, bounds[:-1], bounds[1:])
+        if executor is not None:
+            chunks = list(executor.map(_extract_page_range, *args))
         else:
-            i += 1
+            with ProcessPoolExecutor(max_workers=workers) as ex:
+                chunks = list(ex.map(_extract_page_range, *args))
+        texts = [text for chunk in chunks for text in chunk]
+        if len(texts) != n:
+            raise RuntimeError(
+                f"{pdf_path}: extracted {len(texts)} of {n} pages"
+            )
+
+    return [L for text in texts for L in text.splitlines()]
+
+def _file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def cached_read_lines(pdf_path, executor=None):
+    # Re-running on the same statement skips PDF parsing entirely: the
+    # extracted lines are memoized on disk under the file's content hash,
+    # the cache format version and the pdfplumber version. Entries hold
+    # the statement's full text, so the directory is private to the user.
+    key = f"{_file_sha256(pdf_path)}-v{CACHE_VERSION}-{pdfplumber.__version__}"
+    cache_path = os.path.join(CACHE_DIR, key + ".json")
+    try:
+        with open(cache_path, encoding='utf-8') as f:
+            lines = json.load(f)
+        if isinstance(lines, list) and all(isinstance(L, str) for L in lines):
+            return lines
+    except (OSError, ValueError):
+        pass
+
+    lines = read_lines(pdf_path, executor)
+    tmp = None
+    try:
+        os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+        # write to a temp file and rename so a crash never leaves half a cache
+        fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(lines, f)
+        os.replace(tmp, cache_path)
+    except OSError:
+        # caching is best-effort; just don't leave the temp file behind
+        if tmp is not None:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+    return lines
+
+def parse_transaction(m):
+    L = m.group(1).rstrip()
+    # parse date + amount on the first line
+    date = L[:8]
+    # try to pull amount at end
+    m_amt = _AMT_RE.search(L)
+    if m_amt:
+        amount = m_amt.group(1)
+        # description is everything between date and amount
+        desc = L[9: m_amt.start()].strip()
+    else:
+        amount = ""
+        desc = L[9:].strip()
 
-    # 4) write CSV
+    # append the continuation lines captured after it; group 2 starts
+    # with "\n", so each line gets a leading space
+    desc += " ".join(c.strip() for c in m.group(2).split("\n"))
+
+    return (date, desc, amount)
+
+def extract_transactions(pdf_path, output_csv, executor=None, use_cache=False):
+    # 1) Read every line from every page
+    if use_cache:
+        lines = cached_read_lines(pdf_path, executor)
+    else:
+        lines = read_lines(pdf_path, executor)
+    text = "\n".join(lines)
+
+    # 2) Pick out date-started blocks in one pass over the whole text
+    transactions = [parse_transaction(m) for m in _TX_RE.finditer(text)]
+
+    # 3) write CSV
     if not transactions:
         print("❌ No transactions found.")
         return
 
-    with open(output_csv, 'w', newline='', encoding='utf-8') as f:
-        w = csv.DictWriter(f, fieldnames=["date","description","amount"])
-        w.writeheader()
+    # one large buffer so the whole statement goes out in a few writes
+    with open(output_csv, 'w', newline='', encoding='utf-8',
+              buffering=1 << 20) as f:
+        w = csv.writer(f)
+        w.writerow(["date","description","amount"])
         w.writerows(transactions)
 
     print(f"✅ Extracted {len(transactions)} transactions to {output_csv}")
@@ -68,16 +166,49 @@ def main():
     p = argparse.ArgumentParser(
         description="Extract MM/DD/YY transactions from PDF into CSV"
     )
-    p.add_argument("pdf_path", help="Path to the statement PDF")
+    p.add_argument("pdf_path", nargs="+", help="Path(s) to statement PDFs")
     p.add_argument(
         "-o","--output",
         default=None,
-        help="CSV file to write"
+        help="CSV file to write (only with a single PDF)"
+    )
+    p.add_argument(
+        "--cache",
+        action="store_true",
+        help="Keep extracted statement text in $XDG_CACHE_HOME/wf-bilt "
+             "(default ~/.cache/wf-bilt) to speed up re-runs"
     )
     args = p.parse_args()
-    # If no -o given, use PDF’s basename + .csv
-    out = args.output or args.pdf_path.rsplit(".",1)[0] + ".csv"
-    extract_transactions(args.pdf_path, out)
+    if args.output and len(args.pdf_path) > 1:
+        p.error("-o/--output can only be used with a single PDF")
+
+    # One pool serves every PDF, so worker startup (and the pdfplumber
+    # import in each worker) is paid once per run rather than per file.
+    workers = os.cpu_count() or 1
+    ex = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    failed = []
+    try:
+        for pdf_path in args.pdf_path:
+            # If no -o given, use PDF’s basename + .csv
+            out = args.output or pdf_path.rsplit(".",1)[0] + ".csv"
+            # one bad PDF shouldn't stop the rest of the batch
+            try:
+                extract_transactions(pdf_path, out, ex, args.cache)
+            except Exception as e:
+                print(f"❌ Failed to convert {pdf_path}: {e}", file=sys.stderr)
+                failed.append(pdf_path)
+                if isinstance(e, BrokenProcessPool):
+                    # a crashed worker leaves the pool unusable; start over
+                    ex.shutdown()
+                    ex = ProcessPoolExecutor(max_workers=workers)
+    finally:
+        if ex is not None:
+            ex.shutdown()
+
+    if failed:
+        print(f"❌ {len(failed)} of {len(args.pdf_path)} PDFs failed",
+              file=sys.stderr)
+        sys.exit(1)
 
 if __name__=="__main__":
     main()
\ No newline at end of file